@@ -8,9 +8,17 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
 import os
+import time
+
+_started = time.perf_counter()
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gtstore.settings')
 
 application = get_asgi_application()
+
+# Records setup time and, with WARMUP_ON_STARTUP, warms caches before serving.
+from store.warmup import startup_complete  # noqa: E402
+
+startup_complete("gtstore.asgi", _started)
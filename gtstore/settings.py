@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'store.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'gtstore.urls'
@@ -55,14 +57,24 @@ ROOT_URLCONF = 'gtstore.urls'
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [BASE_DIR / "templates"],  
-        "APP_DIRS": True,
+        "DIRS": [BASE_DIR / "templates"],
         "OPTIONS": {
+            # Compiled templates are kept in memory; `manage.py warmup` / WARMUP_ON_STARTUP fill it.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "store.context_processors.owned_movies",
             ],
         },
     },
@@ -82,6 +94,16 @@ DATABASES = {
 }
 
 
+# Cache
+# Per-process memory cache; point this at Redis/Memcached when running several
+# worker processes so throttle counters and the title index version are shared.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -117,6 +139,21 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Hashed file names + precompressed .gz/.br variants, written at collectstatic time.
+# Install `brotli` to also get .br files.
+# With DEBUG off, `{% static %}` needs the manifest: run `manage.py collectstatic`
+# before serving, or every page that renders base.html fails.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "store.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
 
 # Media files (uploads)
 MEDIA_URL = '/media/'
@@ -132,3 +169,32 @@ LOGOUT_REDIRECT_URL = "movie_list"
 
 
 
+# Background tasks (store.tasks / manage.py run_workers)
+TASK_WORKERS = 2
+TASK_WORKER_MODE = "thread"  # or "process"
+TASK_POLL_INTERVAL = 1.0
+TASK_MAX_ATTEMPTS = 3
+TASK_BACKOFF_BASE_SECONDS = 2
+
+# Request profiling (store.profiling): superusers send `X-Profile: 1` or `?_profile=1`.
+PROFILE_DIR = BASE_DIR / "profiles"
+PROFILE_SAMPLE_RATE = 0.0  # fraction of all requests to profile, e.g. 0.001
+PROFILE_MAX_FILES = 500  # older profiles are deleted as new ones are saved
+
+# Order archival (manage.py archive_orders)
+ORDER_ARCHIVE_AFTER_DAYS = 365
+ORDER_ARCHIVE_BATCH_SIZE = 500
+
+# Throttling (store.throttling): about N requests per sliding period, per user (or IP if anonymous)
+THROTTLE_ENABLED = True
+THROTTLE_RATES = {
+    "cart": "60/m",
+    "review": "10/m",
+    "report_review": "10/m",
+    "petition_vote": "30/m",
+}
+
+# Warm templates, URLs and catalog caches when gtstore.wsgi/asgi start (store.warmup).
+# Off by default: warm-up queries the database, so it needs `migrate` to have run,
+# and runserver imports gtstore.wsgi too. Enable in deployments with WARMUP_ON_STARTUP=1.
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP") == "1"
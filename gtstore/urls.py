@@ -15,14 +15,25 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
+from store import profiling, staticfiles, throttling
 
 urlpatterns = [
+    path("admin/profiles/", admin.site.admin_view(profiling.profile_list), name="profile_list"),
+    path("admin/profiles/<str:name>/", admin.site.admin_view(profiling.profile_detail), name="profile_detail"),
+    path(
+        "admin/profiles/<str:name>/download/",
+        admin.site.admin_view(profiling.profile_download),
+        name="profile_download",
+    ),
+    path("admin/throttling/", admin.site.admin_view(throttling.metrics_view), name="throttle_metrics"),
     path('admin/', admin.site.urls),
     path("", include("store.urls")),
     path("accounts/", include("django.contrib.auth.urls")),
+    # Collected, hashed assets (runserver's own static handler takes over in DEBUG)
+    re_path(r"^%s(?P<path>.*)$" % settings.STATIC_URL.lstrip("/"), staticfiles.serve),
 ]
 
 if settings.DEBUG:
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Movie, Review, ReviewReport, Order, OrderItem, Petition, PetitionVote
+from .models import Movie, Review, ReviewReport, Order, OrderItem, Petition, PetitionVote, Task, ArchivedOrder
 
 admin.site.register(Movie)
 admin.site.register(Review)
@@ -7,4 +7,12 @@ admin.site.register(ReviewReport)
 admin.site.register(Order)
 admin.site.register(OrderItem)
 admin.site.register(Petition)
-admin.site.register(PetitionVote)
\ No newline at end of file
+admin.site.register(PetitionVote)
+admin.site.register(ArchivedOrder)
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_at", "wait_ms", "run_ms")
+    list_filter = ("status", "name")
+    search_fields = ("name", "dedup_key")
@@ -0,0 +1,245 @@
+"""Read-only JSON catalog API.
+
+Rows come straight from `.values()` (no model instances, no templates) and are
+encoded with orjson when it's installed. Every list endpoint supports:
+
+* `fields=a,b,c` to project a subset of the allowed fields
+* `cursor=` / `limit=` keyset pagination (the response carries `next_cursor`)
+* ETag / If-None-Match so unchanged pages come back as 304
+"""
+import base64
+import binascii
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Avg, Count, Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_GET
+
+from .models import Movie, Review, Petition
+from .search import title_index
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+DEFAULT_PAGE_SIZE = 50
+MAX_ID = 2**63 - 1  # BigAutoField
+MAX_PAGE_SIZE = 200
+MAX_SUGGESTIONS = 20
+
+# Public field name -> ORM lookup passed to .values()
+MOVIE_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "price": "price",
+    "description": "description",
+    "image": "image",
+    "image_url": "image_url",
+    "created_at": "created_at",
+    "avg_rating": "avg_rating",
+    "review_count": "review_count",
+}
+MOVIE_DEFAULT_FIELDS = ("id", "title", "price", "image", "image_url", "avg_rating", "review_count")
+
+REVIEW_FIELDS = {
+    "id": "id",
+    "movie_id": "movie_id",
+    "user": "user__username",
+    "rating": "rating",
+    "text": "text",
+    "created_at": "created_at",
+}
+REVIEW_DEFAULT_FIELDS = tuple(REVIEW_FIELDS)
+
+PETITION_FIELDS = {
+    "id": "id",
+    "movie_title": "movie_title",
+    "description": "description",
+    "creator": "creator__username",
+    "created_at": "created_at",
+    "yes_votes": "yes_votes",
+    "no_votes": "no_votes",
+}
+PETITION_DEFAULT_FIELDS = tuple(PETITION_FIELDS)
+
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _json_default(obj):
+    # Decimals, datetimes etc. are formatted by DjangoJSONEncoder, so the output is
+    # the same whether or not orjson is installed.
+    return _django_encoder.default(obj)
+
+
+def _dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+def _json_response(request, payload, status=200):
+    body = _dumps(payload)
+    response = HttpResponse(body, content_type="application/json", status=status)
+    if status != 200:
+        return response
+    etag = '"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest()
+    response["ETag"] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def _error(request, message, status):
+    return _json_response(request, {"error": message}, status=status)
+
+
+def _encode_cursor(last_id):
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def _parse_id(value, what):
+    """Parse a positive database id, raising ValueError for anything else."""
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise ValueError(f"{what} must be an integer")
+    if not (value.isascii() and 0 < parsed <= MAX_ID):
+        raise ValueError(f"{what} out of range")
+    return parsed
+
+
+def _decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        return _parse_id(base64.urlsafe_b64decode(padded.encode()).decode(), "cursor")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def _selected_fields(request, allowed, default):
+    """Resolve `fields=` to a list of public names; raise ValueError on unknown ones."""
+    raw = request.GET.get("fields", "").strip()
+    if not raw:
+        return list(default)
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError("Unknown field(s): %s" % ", ".join(unknown))
+    return names
+
+
+def _page_size(request):
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _values(queryset, allowed, names):
+    """Run `.values()` for the public `names`, renaming ORM lookups back to them."""
+    lookups = [allowed[name] for name in names]
+    rows = queryset.values(*lookups)
+    if lookups == names:
+        return rows
+    pairs = list(zip(names, lookups))
+    return ({name: row[lookup] for name, lookup in pairs} for row in rows)
+
+
+def _list_response(request, queryset, allowed, default, descending=False, transform=None):
+    """Project, keyset-paginate on `id` and render a list endpoint."""
+    try:
+        names = _selected_fields(request, allowed, default)
+        limit = _page_size(request)
+        cursor = request.GET.get("cursor")
+        last_id = _decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        return _error(request, str(exc), 400)
+
+    if last_id is not None:
+        queryset = queryset.filter(id__lt=last_id) if descending else queryset.filter(id__gt=last_id)
+    queryset = queryset.order_by("-id" if descending else "id")
+
+    # Always fetch the id so we can build the next cursor, even if it isn't projected.
+    fetched = names if "id" in names else names + ["id"]
+    rows = list(_values(queryset[: limit + 1], allowed, fetched))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1]["id"])
+    if "id" not in names:
+        for row in rows:
+            del row["id"]
+    if transform is not None:
+        rows = [transform(row) for row in rows]
+    return _json_response(request, {"results": rows, "next_cursor": next_cursor})
+
+
+def _movie_queryset():
+    return Movie.objects.annotate(avg_rating=Avg("reviews__rating"), review_count=Count("reviews"))
+
+
+def _movie_row(row):
+    if row.get("image"):
+        row["image"] = settings.MEDIA_URL + row["image"]
+    return row
+
+
+@require_GET
+def movie_list(request):
+    q = request.GET.get("q", "").strip()
+    movies = _movie_queryset()
+    if q:
+        movies = movies.filter(Q(title__icontains=q) | Q(description__icontains=q))
+    return _list_response(request, movies, MOVIE_FIELDS, MOVIE_DEFAULT_FIELDS, transform=_movie_row)
+
+
+@require_GET
+def movie_detail(request, pk):
+    try:
+        names = _selected_fields(request, MOVIE_FIELDS, MOVIE_FIELDS)
+    except ValueError as exc:
+        return _error(request, str(exc), 400)
+    row = next(iter(_values(_movie_queryset().filter(pk=pk), MOVIE_FIELDS, names)), None)
+    if row is None:
+        return _error(request, "Not found", 404)
+    return _json_response(request, _movie_row(row))
+
+
+@require_GET
+def movie_autocomplete(request):
+    """Title suggestions from the in-memory prefix index (no DB query)."""
+    try:
+        limit = min(max(int(request.GET.get("limit", 10)), 1), MAX_SUGGESTIONS)
+    except ValueError:
+        return _error(request, "limit must be an integer", 400)
+    return _json_response(request, {"results": title_index.search(request.GET.get("q", ""), limit)})
+
+
+@require_GET
+def review_list(request):
+    reviews = Review.objects.all()
+    movie_id = request.GET.get("movie")
+    if movie_id:
+        try:
+            reviews = reviews.filter(movie_id=_parse_id(movie_id, "movie"))
+        except ValueError as exc:
+            return _error(request, str(exc), 400)
+    return _list_response(request, reviews, REVIEW_FIELDS, REVIEW_DEFAULT_FIELDS, descending=True)
+
+
+@require_GET
+def petition_list(request):
+    # Same visibility as the HTML page, but answer with 401 instead of a login redirect.
+    if not request.user.is_authenticated:
+        return _error(request, "Authentication required", 401)
+    petitions = Petition.objects.annotate(
+        yes_votes=Count("votes", filter=Q(votes__vote_type="yes")),
+        no_votes=Count("votes", filter=Q(votes__vote_type="no")),
+    )
+    return _list_response(request, petitions, PETITION_FIELDS, PETITION_DEFAULT_FIELDS, descending=True)
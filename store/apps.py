@@ -3,3 +3,8 @@ from django.apps import AppConfig
 class StoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "store"
+
+    def ready(self):
+        # Connects the Movie signals that keep the title index current and
+        # registers the THROTTLE_RATES system check.
+        from . import search, throttling  # noqa: F401
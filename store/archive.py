@@ -0,0 +1,51 @@
+"""Move old orders from the hot Order/OrderItem tables into ArchivedOrder."""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedOrder, Order, OrderItem
+
+ARCHIVE_AFTER_DAYS = getattr(settings, "ORDER_ARCHIVE_AFTER_DAYS", 365)
+ARCHIVE_BATCH_SIZE = getattr(settings, "ORDER_ARCHIVE_BATCH_SIZE", 500)
+
+
+def archive_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    """Archive up to `batch_size` orders created before `cutoff`; return how many moved."""
+    with transaction.atomic():
+        orders = list(
+            Order.objects.filter(created_at__lt=cutoff)
+            .order_by("id")
+            .prefetch_related("items__movie")[:batch_size]
+        )
+        if not orders:
+            return 0
+        archived = []
+        for order in orders:
+            items = [(it.movie_id, it.quantity, it.price, it.movie.title) for it in order.items.all()]
+            archived.append(ArchivedOrder(
+                id=order.id,
+                user_id=order.user_id,
+                created_at=order.created_at,
+                total=sum((quantity * price for _, quantity, price, _ in items), 0),
+                items_blob=ArchivedOrder.pack_items(items),
+            ))
+        ArchivedOrder.objects.bulk_create(archived)
+        order_ids = [order.id for order in orders]
+        OrderItem.objects.filter(order_id__in=order_ids).delete()
+        Order.objects.filter(id__in=order_ids).delete()
+    return len(orders)
+
+
+def archive_orders(older_than_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None):
+    """Archive orders in bounded batches (one transaction each) until none are left."""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    total = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        if not moved:
+            break
+        total += moved
+        batches += 1
+    return total
@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .owned import owned_movie_ids
+
+
+def owned_movies(request):
+    """Expose `owned_movie_ids`; it's only loaded if a template actually uses it."""
+    return {"owned_movie_ids": SimpleLazyObject(lambda: owned_movie_ids(request.user))}
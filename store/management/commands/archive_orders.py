@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from store import archive
+
+
+class Command(BaseCommand):
+    help = "Move orders older than N days into the ArchivedOrder table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=archive.ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=archive.ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+
+    def handle(self, *args, **options):
+        moved = archive.archive_orders(
+            older_than_days=options["older_than_days"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(f"Archived {moved} order(s)")
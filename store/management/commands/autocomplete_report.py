@@ -0,0 +1,55 @@
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from store.search import TitleIndex
+
+WORDS = (
+    "the a of and night day man woman return rise fall last first dark light star war love "
+    "home lost city king queen dream secret story house road river fire ice blood ghost "
+    "shadow empire legend hunter storm island summer winter space time world heart edge"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Report memory footprint and lookup latency of the title index on a synthetic catalog."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--titles", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        n = options["titles"]
+        # A generator, so the title strings are only held (and counted) by the index.
+        titles = (
+            (i, " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5))).title() + f" {i}")
+            for i in range(1, n + 1)
+        )
+
+        index = TitleIndex()
+        tracemalloc.start()
+        start = time.perf_counter()
+        index.build(rows=titles)
+        build_seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        prefixes = []
+        for _ in range(options["queries"]):
+            word = rng.choice(WORDS)
+            prefixes.append(word[: rng.randint(1, len(word))])
+        start = time.perf_counter()
+        for prefix in prefixes:
+            index.search(prefix)
+        per_query_us = (time.perf_counter() - start) / len(prefixes) * 1e6
+
+        self.stdout.write(f"titles:          {n:,}")
+        self.stdout.write(f"index entries:   {len(index):,}")
+        self.stdout.write(f"build time:      {build_seconds:.2f} s (slowed by tracemalloc)")
+        self.stdout.write(f"resident size:   {current / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB during build)")
+        self.stdout.write(f"bytes per title: {current / n:.0f}")
+        self.stdout.write(f"lookup latency:  {per_query_us:.1f} us/query (top 10)")
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from store.models import Movie
+
+
+class Command(BaseCommand):
+    help = "Compare requests/second of the HTML catalog views against the JSON API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def handle(self, *args, **options):
+        n = options["requests"]
+        client = Client()
+        movie_id = Movie.objects.values_list("id", flat=True).first()
+
+        pairs = [("movie_list", reverse("movie_list"), reverse("api_movie_list"))]
+        if movie_id is not None:
+            pairs.append((
+                "movie_detail",
+                reverse("movie_detail", args=[movie_id]),
+                reverse("api_movie_detail", args=[movie_id]),
+            ))
+
+        self.stdout.write(f"{'view':<14}{'html req/s':>12}{'json req/s':>12}{'speedup':>10}")
+        for name, html_url, json_url in pairs:
+            html_rps = self._rps(client, html_url, n)
+            json_rps = self._rps(client, json_url, n)
+            self.stdout.write(f"{name:<14}{html_rps:>12.0f}{json_rps:>12.0f}{json_rps / html_rps:>9.1f}x")
+
+    def _rps(self, client, url, n):
+        response = client.get(url)  # warm up
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned {response.status_code}")
+        start = time.perf_counter()
+        for _ in range(n):
+            client.get(url)
+        return n / (time.perf_counter() - start)
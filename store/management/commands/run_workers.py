@@ -0,0 +1,100 @@
+import logging
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from store import tasks
+from store.workers import run_worker_process
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Run background task workers (see store.tasks)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=getattr(settings, "TASK_WORKERS", 2),
+            help="Number of workers to run.",
+        )
+        parser.add_argument(
+            "--mode", choices=["thread", "process"], default=getattr(settings, "TASK_WORKER_MODE", "thread"),
+            help="Run workers as threads in this process or as separate processes.",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=getattr(settings, "TASK_POLL_INTERVAL", 1.0),
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain due tasks and exit.")
+        parser.add_argument(
+            "--stats", action="store_true",
+            help="Print per-task counts and wait/run latency of finished tasks, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self._print_stats()
+            return
+
+        requeued = tasks.requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale task(s)")
+
+        stop = multiprocessing.Event() if options["mode"] == "process" else threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+
+        worker_args = (stop, options["poll_interval"], options["once"])
+        if options["mode"] == "process":
+            # Don't let children inherit the parent's open DB connections.
+            connections.close_all()
+            workers = [multiprocessing.Process(target=run_worker_process, args=worker_args)
+                       for _ in range(options["workers"])]
+        else:
+            workers = [threading.Thread(target=_worker_loop, args=worker_args, daemon=True)
+                       for _ in range(options["workers"])]
+
+        self.stdout.write(f"Starting {len(workers)} {options['mode']} worker(s)")
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+
+    def _print_stats(self):
+        rows = list(tasks.task_metrics())
+        if not rows:
+            self.stdout.write("No finished tasks yet")
+            return
+        self.stdout.write(f"{'task':<40}{'count':>7}{'avg wait':>10}{'max wait':>10}{'avg run':>10}{'max run':>10}  (ms)")
+        for row in rows:
+            self.stdout.write(
+                f"{row['name']:<40}{row['count']:>7}{row['avg_wait_ms'] or 0:>10.0f}{row['max_wait_ms'] or 0:>10}"
+                f"{row['avg_run_ms'] or 0:>10.0f}{row['max_run_ms'] or 0:>10}"
+            )
+
+
+def _worker_loop(stop, poll_interval, once):
+    try:
+        while not stop.is_set():
+            try:
+                close_old_connections()
+                task = tasks.claim_next()
+                if task is None:
+                    if once:
+                        return
+                    stop.wait(poll_interval)
+                    continue
+                tasks.run_task(task)
+            except Exception:
+                # e.g. SQLite "database is locked": keep this worker alive. A task whose
+                # final save failed stays RUNNING until requeue_stale() picks it up.
+                logger.exception("Worker error, retrying in %s s", poll_interval)
+                connections.close_all()
+                stop.wait(poll_interval)
+    finally:
+        connections.close_all()
@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from store.warmup import warm_up
+
+# Run in a fresh interpreter: time the import of the entry point (which also
+# runs the startup warm-up) and report what it recorded.
+PROBE = """
+import json, time
+t = time.perf_counter()
+import importlib
+importlib.import_module({module!r})
+import_ms = round((time.perf_counter() - t) * 1000, 1)
+from store.warmup import STARTUP_TIMINGS
+print(json.dumps({{"import_ms": import_ms, **STARTUP_TIMINGS}}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Warm templates, URLs and catalog caches; optionally measure cold-start time of gtstore.wsgi/asgi."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--measure-startup", action="store_true",
+            help="Import gtstore.wsgi and gtstore.asgi in fresh processes and report their startup cost.",
+        )
+        parser.add_argument("--record", metavar="FILE", help="Append the measurements as a JSON line to FILE.")
+        parser.add_argument("--label", default="", help="Release label stored with --record.")
+
+    def handle(self, *args, **options):
+        result = {"warmup": warm_up()}
+        for step, ms in result["warmup"].items():
+            self.stdout.write(f"warm {step:<12} {ms:>8.1f} ms")
+
+        if options["measure_startup"]:
+            for module in ("gtstore.wsgi", "gtstore.asgi"):
+                result[module] = self._measure(module)
+                self.stdout.write(
+                    f"{module:<13} process {result[module]['process_ms']:>8.1f} ms, "
+                    f"import {result[module]['import_ms']:>8.1f} ms, "
+                    f"setup {result[module]['setup_ms']:>8.1f} ms"
+                )
+
+        if options["record"]:
+            result.update(label=options["label"], recorded_at=timezone.now().isoformat())
+            with open(options["record"], "a") as f:
+                f.write(json.dumps(result) + "\n")
+            self.stdout.write(f"Recorded to {options['record']}")
+
+    def _measure(self, module):
+        env = dict(
+            os.environ,
+            DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "gtstore.settings"),
+            WARMUP_ON_STARTUP="1",  # measure startup the way deployments run it
+        )
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        process_ms = round((time.perf_counter() - start) * 1000, 1)
+        if proc.returncode != 0:
+            raise CommandError(f"Importing {module} failed:\n{proc.stderr}")
+        timings = json.loads(proc.stdout.strip().splitlines()[-1])
+        timings["process_ms"] = process_ms
+        return timings
@@ -1,3 +1,7 @@
+import struct
+from decimal import Decimal
+from typing import NamedTuple
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -68,6 +72,65 @@ class OrderItem(models.Model):
         return f"{self.movie.title} x {self.quantity}"
 
 
+
+class ArchivedLineItem(NamedTuple):
+    movie_id: int
+    quantity: int
+    price: Decimal
+    title: str
+
+    def line_total(self):
+        return self.quantity * self.price
+
+
+class ArchivedOrder(models.Model):
+    """Cold copy of an old Order, written by `manage.py archive_orders`.
+
+    Keeps the original order id. Line items are packed into `items_blob` as
+    (movie id, quantity, price in cents, title length) headers, each followed
+    by the UTF-8 title, instead of one row per item. The title is a snapshot,
+    so history stays readable after the movie itself is deleted.
+    """
+    ITEM_HEADER = struct.Struct("<qIqH")
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_orders")
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    total = models.DecimalField(max_digits=10, decimal_places=2)
+    items_blob = models.BinaryField()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "-created_at"])]
+
+    @classmethod
+    def pack_items(cls, items):
+        """Encode `(movie_id, quantity, price, title)` tuples."""
+        parts = []
+        for movie_id, quantity, price, title in items:
+            encoded = title.encode()
+            parts.append(cls.ITEM_HEADER.pack(movie_id, quantity, int(price * 100), len(encoded)))
+            parts.append(encoded)
+        return b"".join(parts)
+
+    def line_items(self):
+        blob = bytes(self.items_blob)
+        items, pos = [], 0
+        while pos < len(blob):
+            movie_id, quantity, cents, title_len = self.ITEM_HEADER.unpack_from(blob, pos)
+            pos += self.ITEM_HEADER.size
+            title = blob[pos:pos + title_len].decode()
+            pos += title_len
+            items.append(ArchivedLineItem(movie_id, quantity, Decimal(cents).scaleb(-2), title))
+        return items
+
+    def movie_ids(self):
+        return [item.movie_id for item in self.line_items()]
+
+    def __str__(self):
+        return f"Archived order #{self.id} by {self.user.username} on {self.created_at:%Y-%m-%d}"
+
+
 # NEW PETITION MODELS
 class Petition(models.Model):
     """Movie petition that users can create to request movies be added to catalog"""
@@ -121,4 +184,50 @@ class PetitionVote(models.Model):
         unique_together = ("petition", "user")  # One vote per user per petition
 
     def __str__(self):
-        return f"{self.user.username} voted '{self.vote_type}' on {self.petition.movie_title}"
\ No newline at end of file
+        return f"{self.user.username} voted '{self.vote_type}' on {self.petition.movie_title}"
+
+class Task(models.Model):
+    """A unit of background work, run by `manage.py run_workers`.
+
+    Queue work with `store.tasks.enqueue()` rather than creating rows directly.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=200, help_text="Dotted path of the task function")
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(max_length=200, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    run_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Latency metrics for the last attempt, in milliseconds
+    wait_ms = models.PositiveIntegerField(null=True, blank=True)
+    run_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_at"])]
+        constraints = [
+            # At most one queued/running task per dedup key
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="unique_active_task_dedup_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
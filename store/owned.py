@@ -0,0 +1,42 @@
+"""Per-user set of purchased movie ids, cached as a packed array.
+
+One cache hit per request answers "does this user own movie X?" for every
+card on a page. The cache key includes a stamp of the user's orders (count and
+latest id), read with one small indexed query, so a checkout handled by any
+worker process changes the key everywhere, even with a per-process cache.
+"""
+from array import array
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import ArchivedOrder, Order, OrderItem
+
+CACHE_TIMEOUT = 60 * 60  # entries under an outdated stamp are never read again
+
+
+def _orders_stamp(user_id):
+    stats = Order.objects.filter(user_id=user_id).aggregate(count=Count("id"), latest=Max("id"))
+    return f"{stats['count']}.{stats['latest'] or 0}"
+
+
+def _cache_key(user_id):
+    return f"owned_movie_ids:{user_id}:{_orders_stamp(user_id)}"
+
+
+def owned_movie_ids(user):
+    """Return a frozenset of movie ids the user has ordered (empty for anonymous users)."""
+    if not user.is_authenticated:
+        return frozenset()
+    key = _cache_key(user.pk)
+    packed = cache.get(key)
+    if packed is None:
+        ids = set(OrderItem.objects.filter(order__user_id=user.pk).values_list("movie_id", flat=True))
+        for archived in ArchivedOrder.objects.filter(user_id=user.pk).only("items_blob"):
+            ids.update(archived.movie_ids())
+        ids = sorted(ids)
+        packed = array("q", ids).tobytes()
+        cache.set(key, packed, CACHE_TIMEOUT)
+    ids = array("q")
+    ids.frombytes(packed)
+    return frozenset(ids)
@@ -0,0 +1,201 @@
+"""On-demand request profiling.
+
+A request is profiled when a superuser sends `X-Profile: 1` or `?_profile=1`,
+or when it's picked by `PROFILE_SAMPLE_RATE`. The whole view runs under
+cProfile and every SQL query is logged (parameters of session/auth queries
+are redacted). Both are written to `PROFILE_DIR`, which keeps the newest
+`PROFILE_MAX_FILES` profiles, and can be browsed by superusers at /admin/profiles/.
+
+Requests that don't ask for profiling only pay for a header/GET lookup.
+"""
+import cProfile
+import heapq
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+PROFILE_DIR = Path(getattr(settings, "PROFILE_DIR", settings.BASE_DIR / "profiles"))
+PROFILE_SAMPLE_RATE = getattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+PROFILE_MAX_FILES = getattr(settings, "PROFILE_MAX_FILES", 500)
+PROFILE_LIST_SIZE = 200
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_PARAM = "_profile"
+PROFILE_NAME = re.compile(r"^[\w.-]+$")
+# Parameters of queries on these tables hold session keys/data and credentials.
+SENSITIVE_TABLES = re.compile(r'\b"?(django_session|auth_\w+)"?', re.IGNORECASE)
+REDACTED = "[redacted]"
+
+_profiler_lock = threading.Lock()
+
+
+class QueryLog:
+    """`connection.execute_wrapper` that records each query with its duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                "sql": sql,
+                "params": REDACTED if SENSITIVE_TABLES.search(sql) else repr(params),
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._wants_profile(request):
+            return self.get_response(request)
+        return self._profile(request)
+
+    def _wants_profile(self, request):
+        if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+            return True
+        if request.META.get(PROFILE_HEADER) == "1" or (
+            PROFILE_PARAM in request.META.get("QUERY_STRING", "") and request.GET.get(PROFILE_PARAM) == "1"
+        ):
+            # Only now touch request.user (it may cost a session/user query).
+            # Superusers only, like the pages that show the results.
+            return request.user.is_superuser
+        return False
+
+    def _profile(self, request):
+        # cProfile can only be active once per process; overlapping requests run unprofiled.
+        if not _profiler_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self._run_profiled(request)
+        finally:
+            _profiler_lock.release()
+
+    def _run_profiled(self, request):
+        profiler = cProfile.Profile()
+        query_log = QueryLog()
+        start = time.perf_counter()
+        with connection.execute_wrapper(query_log):
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._save(request, response, profiler, query_log, elapsed_ms)
+        return response
+
+    def _save(self, request, response, profiler, query_log, elapsed_ms):
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        stem = "%s-%s-%d" % (timezone.now().strftime("%Y%m%dT%H%M%S%f"), re.sub(r"[^\w.-]", "_", view), os.getpid())
+        profiler.dump_stats(PROFILE_DIR / f"{stem}.prof")
+        meta = {
+            "path": request.get_full_path(),
+            "method": request.method,
+            "view": view,
+            "status": response.status_code,
+            "ms": round(elapsed_ms, 1),
+            "query_count": len(query_log.queries),
+            "query_ms": round(sum(q["ms"] for q in query_log.queries), 1),
+            "queries": query_log.queries,
+        }
+        with open(PROFILE_DIR / f"{stem}.json", "w") as f:
+            json.dump(meta, f, indent=1)
+        _prune()
+
+
+def _prune():
+    """Delete the oldest profiles beyond PROFILE_MAX_FILES (names sort by capture time)."""
+    stems = sorted(path.stem for path in PROFILE_DIR.glob("*.json"))
+    for stem in stems[:max(len(stems) - PROFILE_MAX_FILES, 0)]:
+        for suffix in (".json", ".prof"):
+            (PROFILE_DIR / f"{stem}{suffix}").unlink(missing_ok=True)
+
+
+def superuser_required(view):
+    """Profiles can include any user's requests, so only superusers may read them."""
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        return view(request, *args, **kwargs)
+
+    return wrapped
+
+
+def _load_meta(name):
+    if not PROFILE_NAME.match(name):
+        raise Http404
+    try:
+        with open(PROFILE_DIR / f"{name}.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise Http404
+
+
+@superuser_required
+def profile_list(request):
+    """Admin page listing captured profiles, newest first."""
+    profiles = []
+    if PROFILE_DIR.is_dir():
+        for path in heapq.nlargest(PROFILE_LIST_SIZE, PROFILE_DIR.glob("*.json")):
+            try:
+                meta = _load_meta(path.stem)
+            except (Http404, OSError, ValueError):
+                continue  # truncated or corrupt file
+            meta.pop("queries", None)
+            meta["name"] = path.stem
+            profiles.append(meta)
+    return render(request, "admin/profiles/list.html", {
+        "profiles": profiles,
+        "max_files": PROFILE_MAX_FILES,
+        "title": "Request profiles",
+    })
+
+
+@superuser_required
+def profile_detail(request, name):
+    meta = _load_meta(name)
+    prof_path = PROFILE_DIR / f"{name}.prof"
+    if not prof_path.is_file():
+        raise Http404
+    sort = request.GET.get("sort", "cumulative")
+    if sort not in ("cumulative", "tottime", "calls"):
+        sort = "cumulative"
+    out = io.StringIO()
+    stats = pstats.Stats(str(prof_path), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(40)
+    return render(request, "admin/profiles/detail.html", {
+        "name": name,
+        "meta": meta,
+        "stats": out.getvalue(),
+        "sort": sort,
+        "title": f"Profile of {meta['path']}",
+    })
+
+
+@superuser_required
+def profile_download(request, name):
+    if not PROFILE_NAME.match(name) or not (PROFILE_DIR / f"{name}.prof").is_file():
+        raise Http404
+    return FileResponse(open(PROFILE_DIR / f"{name}.prof", "rb"), as_attachment=True, filename=f"{name}.prof")
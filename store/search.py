@@ -0,0 +1,184 @@
+"""In-process prefix index over `Movie.title` for type-ahead search.
+
+Entries are kept in one sorted array so a lookup is a `bisect` plus a short scan.
+Each title is indexed from its start and from the start of every later word,
+so "no way" finds "Spider Man: No Way Home".
+
+The index lives in the worker process: it's built on first use (or by
+`title_index.build()`) and kept current by the Movie signals below. Changes
+made by other processes are noticed by a staleness check, at most every
+`TITLE_INDEX_CHECK_SECONDS`: the Movie count and max id, plus a version
+counter in the default cache that the signals bump (which also catches
+renames when the cache is shared). Any difference triggers a rebuild.
+"""
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Movie
+
+WORD_START = re.compile(r"\w+")
+# Movie.title is at most 200 chars, but casefold() can expand a character to
+# three (e.g. "ΐ"), so leave room for 600+; later offsets are skipped, never wrapped.
+OFFSET_BITS = 10
+MAX_OFFSET = (1 << OFFSET_BITS) - 1
+CHECK_SECONDS = getattr(settings, "TITLE_INDEX_CHECK_SECONDS", 10)
+VERSION_KEY = "title-index:version"
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def movie_stamp():
+    """Cheap fingerprint of the Movie table as every process sees it."""
+    stats = Movie.objects.aggregate(count=Count("id"), max_id=Max("id"))
+    return stats["count"], stats["max_id"], cache.get(VERSION_KEY, 0)
+
+
+def word_offsets(norm):
+    """Offsets of every word start in a normalized title that fit in OFFSET_BITS."""
+    return [m.start() for m in WORD_START.finditer(norm) if m.start() <= MAX_OFFSET] or [0]
+
+
+class TitleIndex:
+    """Sorted array of `(movie id, word offset)` pairs packed into one int each.
+
+    The key of an entry is the normalized title from that offset on; it's
+    computed on the fly during bisection rather than stored, which keeps the
+    index to 8 bytes per entry plus one normalized string per title.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = array("q")
+        self._norm = {}  # id -> normalized title
+        self._titles = {}  # id -> display title
+        self._built = False
+        self._stamp = None  # movie_stamp() at the last build from the DB
+        self._checked_at = 0.0
+
+    def _key(self, entry):
+        return self._norm[entry >> OFFSET_BITS][entry & MAX_OFFSET:]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def build(self, rows=None):
+        """(Re)build from `(id, title)` pairs, defaulting to the Movie table."""
+        stamp = None
+        if rows is None:
+            # Taken before reading, so changes made meanwhile trigger another rebuild.
+            stamp = movie_stamp()
+            rows = Movie.objects.values_list("id", "title").iterator()
+        norm, titles, entries = {}, {}, []
+        for movie_id, title in rows:
+            n = normalize(title)
+            norm[movie_id] = n
+            titles[movie_id] = title
+            entries.extend((movie_id << OFFSET_BITS) | off for off in word_offsets(n))
+        entries.sort(key=lambda e: norm[e >> OFFSET_BITS][e & MAX_OFFSET:])
+        with self._lock:
+            self._entries, self._norm, self._titles = array("q", entries), norm, titles
+            self._built = True
+            self._stamp, self._checked_at = stamp, time.monotonic()
+
+    def ensure_built(self):
+        """Build on first use, and rebuild when another process changed the movies."""
+        if not self._built:
+            self.build()
+            return
+        if self._stamp is None or time.monotonic() - self._checked_at < CHECK_SECONDS:
+            return
+        self._checked_at = time.monotonic()
+        if movie_stamp() != self._stamp:
+            self.build()
+
+    def search(self, prefix, limit=10):
+        """Return up to `limit` `{"id", "title"}` dicts whose title matches `prefix`."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        self.ensure_built()
+        results = []
+        seen = set()
+        with self._lock:
+            entries = self._entries
+            i = bisect_left(entries, prefix, key=self._key)
+            while i < len(entries) and len(results) < limit:
+                entry = entries[i]
+                if not self._key(entry).startswith(prefix):
+                    break
+                movie_id = entry >> OFFSET_BITS
+                if movie_id not in seen:
+                    seen.add(movie_id)
+                    results.append({"id": movie_id, "title": self._titles[movie_id]})
+                i += 1
+        return results
+
+    def add(self, movie_id, title):
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(movie_id)
+            n = normalize(title)
+            self._norm[movie_id] = n
+            self._titles[movie_id] = title
+            for off in word_offsets(n):
+                i = bisect_right(self._entries, n[off:], key=self._key)
+                self._entries.insert(i, (movie_id << OFFSET_BITS) | off)
+
+    def remove(self, movie_id):
+        with self._lock:
+            if self._built:
+                self._remove(movie_id)
+
+    def _remove(self, movie_id):
+        n = self._norm.get(movie_id)
+        if n is None:
+            return
+        for off in word_offsets(n):
+            entry = (movie_id << OFFSET_BITS) | off
+            i = bisect_left(self._entries, n[off:], key=self._key)
+            while i < len(self._entries) and self._key(self._entries[i]) == n[off:]:
+                if self._entries[i] == entry:
+                    del self._entries[i]
+                    break
+                i += 1
+        del self._norm[movie_id]
+        del self._titles[movie_id]
+
+
+title_index = TitleIndex()
+
+
+def _bump_version():
+    """Tell other processes' indexes to rebuild on their next check."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        if not cache.add(VERSION_KEY, 1, None):
+            cache.incr(VERSION_KEY)
+
+
+@receiver(post_save, sender=Movie, dispatch_uid="store.search.movie_saved")
+def _movie_saved(sender, instance, **kwargs):
+    pk, title = instance.pk, instance.title
+    transaction.on_commit(lambda: title_index.add(pk, title))
+    transaction.on_commit(_bump_version)
+
+
+@receiver(post_delete, sender=Movie, dispatch_uid="store.search.movie_deleted")
+def _movie_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: title_index.remove(pk))
+    transaction.on_commit(_bump_version)
@@ -0,0 +1,73 @@
+import gzip
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.views import static
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are written without it
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".map", ".svg", ".json", ".txt", ".html", ".xml")
+MIN_COMPRESS_SIZE = 256
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest-hashed storage that also writes .gz (and .br) siblings.
+
+    Compression happens once at `collectstatic` time so requests never pay for it.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._write_compressed(name)
+
+    def _write_compressed(self, name):
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(data)))
+        for suffix, compressed in variants:
+            # Skip variants that don't actually save bytes.
+            if len(compressed) >= len(data):
+                continue
+            with open(self.path(name + suffix), "wb") as out:
+                out.write(compressed)
+
+
+@lru_cache(maxsize=None)
+def _hashed_names():
+    return frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
+
+
+def serve(request, path, document_root=None):
+    """Serve a collected static file, preferring a precompressed variant.
+
+    Hashed names from the manifest get far-future immutable caching; anything
+    else falls back to Django's default headers.
+    """
+    document_root = document_root or settings.STATIC_ROOT
+    accept_encoding = request.headers.get("Accept-Encoding", "")
+    served_path = path
+    for suffix, coding in ((".br", "br"), (".gz", "gzip")):
+        if coding in accept_encoding and os.path.isfile(safe_join(document_root, path + suffix)):
+            served_path = path + suffix
+            break
+    response = static.serve(request, served_path, document_root=document_root)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if path in _hashed_names():
+        response["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
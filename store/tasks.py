@@ -0,0 +1,148 @@
+"""Small DB-backed task queue.
+
+Define a task with `@background_task` and queue it from a view with
+`my_task.enqueue(...)` (or `enqueue("dotted.path", ...)`). Rows are written
+on `transaction.on_commit`, so a task never runs against data that was rolled
+back. `manage.py run_workers` picks them up.
+"""
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = getattr(settings, "TASK_MAX_ATTEMPTS", 3)
+BACKOFF_BASE_SECONDS = getattr(settings, "TASK_BACKOFF_BASE_SECONDS", 2)
+BACKOFF_MAX_SECONDS = getattr(settings, "TASK_BACKOFF_MAX_SECONDS", 600)
+STALE_SECONDS = getattr(settings, "TASK_STALE_SECONDS", 3600)
+
+
+def background_task(func=None, *, max_attempts=None):
+    """Mark a function as a task and give it an `.enqueue()` shortcut.
+
+    Task arguments must be JSON-serializable (pass ids, not model instances).
+    """
+    def decorate(f):
+        f.task_name = f"{f.__module__}.{f.__qualname__}"
+        f.max_attempts = max_attempts or DEFAULT_MAX_ATTEMPTS
+
+        def enqueue_task(*args, dedup_key=None, delay=None, **kwargs):
+            return enqueue(f, *args, dedup_key=dedup_key, delay=delay, **kwargs)
+
+        f.enqueue = enqueue_task
+        return f
+
+    return decorate(func) if func is not None else decorate
+
+
+def enqueue(func, *args, dedup_key=None, delay=None, **kwargs):
+    """Queue `func(*args, **kwargs)` once the current transaction commits.
+
+    `func` is a task function or its dotted path. With `dedup_key`, the task is
+    dropped if one with the same key is already pending or running.
+    `delay` (seconds) postpones the first attempt.
+    """
+    if callable(func):
+        name = getattr(func, "task_name", f"{func.__module__}.{func.__qualname__}")
+        max_attempts = getattr(func, "max_attempts", DEFAULT_MAX_ATTEMPTS)
+    else:
+        name, max_attempts = func, DEFAULT_MAX_ATTEMPTS
+
+    def create():
+        run_at = timezone.now() + timedelta(seconds=delay or 0)
+        try:
+            with transaction.atomic():
+                Task.objects.create(
+                    name=name,
+                    args=list(args),
+                    kwargs=kwargs,
+                    dedup_key=dedup_key,
+                    max_attempts=max_attempts,
+                    run_at=run_at,
+                )
+        except IntegrityError:
+            if dedup_key is None:
+                raise
+            logger.debug("Skipping duplicate task %s (%s)", name, dedup_key)
+
+    transaction.on_commit(create)
+
+
+def backoff_seconds(attempts):
+    return min(BACKOFF_BASE_SECONDS ** attempts, BACKOFF_MAX_SECONDS)
+
+
+def claim_next():
+    """Atomically move the oldest due task to RUNNING and return it, or None."""
+    now = timezone.now()
+    candidates = (
+        Task.objects.filter(status=Task.PENDING, run_at__lte=now)
+        .order_by("run_at", "id")
+        .values_list("id", flat=True)[:10]
+    )
+    for task_id in candidates:
+        # The conditional update is the lock: only one worker can flip the status.
+        claimed = Task.objects.filter(pk=task_id, status=Task.PENDING).update(
+            status=Task.RUNNING, started_at=now, attempts=F("attempts") + 1
+        )
+        if claimed:
+            return Task.objects.get(pk=task_id)
+    return None
+
+
+def requeue_stale(seconds=STALE_SECONDS):
+    """Put back tasks left RUNNING by a worker that died mid-task."""
+    cutoff = timezone.now() - timedelta(seconds=seconds)
+    return Task.objects.filter(status=Task.RUNNING, started_at__lt=cutoff).update(
+        status=Task.PENDING, run_at=timezone.now()
+    )
+
+
+def run_task(task):
+    """Execute a claimed task and record its outcome and latency."""
+    start = time.perf_counter()
+    task.wait_ms = max(int((task.started_at - task.run_at).total_seconds() * 1000), 0)
+    try:
+        func = import_string(task.name)
+        func(*task.args, **task.kwargs)
+    except Exception:
+        task.last_error = traceback.format_exc()
+        if task.attempts < task.max_attempts:
+            task.status = Task.PENDING
+            task.run_at = timezone.now() + timedelta(seconds=backoff_seconds(task.attempts))
+            logger.warning("Task %s failed (attempt %s), retrying at %s", task, task.attempts, task.run_at)
+        else:
+            task.status = Task.FAILED
+            logger.error("Task %s failed permanently after %s attempts", task, task.attempts)
+    else:
+        task.status = Task.DONE
+        task.last_error = ""
+    task.run_ms = int((time.perf_counter() - start) * 1000)
+    task.finished_at = timezone.now()
+    task.save(update_fields=["status", "run_at", "last_error", "finished_at", "wait_ms", "run_ms"])
+    return task
+
+
+def task_metrics():
+    """Per-task-name counts and average/max latency of finished tasks."""
+    return (
+        Task.objects.filter(status__in=[Task.DONE, Task.FAILED])
+        .values("name")
+        .annotate(
+            count=Count("id"),
+            avg_wait_ms=Avg("wait_ms"),
+            max_wait_ms=Max("wait_ms"),
+            avg_run_ms=Avg("run_ms"),
+            max_run_ms=Max("run_ms"),
+        )
+        .order_by("name")
+    )
@@ -1,3 +1,590 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import api, archive, owned, profiling, search, staticfiles, tasks, throttling, warmup
+from .management.commands.run_workers import _worker_loop
+from .models import ArchivedOrder, Movie, Order, OrderItem, Review, Task
+from .search import TitleIndex, title_index
+from .tasks import background_task
+
+CALLS = []
+
+
+@background_task
+def record_call(value):
+    CALLS.append(value)
+
+
+@background_task(max_attempts=2)
+def always_fails():
+    raise RuntimeError("boom")
+
+
+# Tests run with DEBUG off and without collectstatic, so pages can't use the
+# manifest storage configured in settings.
+TEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+MANIFEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "store.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+BOOTSTRAP_CSS = "vendor/bootstrap/css/bootstrap.min.css"
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class StoreTestCase(TestCase):
+    pass
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class StoreTransactionTestCase(TransactionTestCase):
+    pass
+
+
+class StaticAssetsTests(StoreTestCase):
+    def test_pages_render_without_collectstatic(self):
+        response = self.client.get("/movies/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "/static/" + BOOTSTRAP_CSS)
+
+
+class CollectedStaticTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        cls.enterClassContext(override_settings(STORAGES=MANIFEST_STORAGES, STATIC_ROOT=cls.static_root))
+        call_command("collectstatic", interactive=False, verbosity=0)
+        staticfiles._hashed_names.cache_clear()
+        cls.addClassCleanup(staticfiles._hashed_names.cache_clear)
+        cls.hashed_css = staticfiles_storage.stored_name(BOOTSTRAP_CSS)
+
+    def get(self, path, **headers):
+        return staticfiles.serve(RequestFactory().get("/static/" + path, headers=headers), path)
+
+    def test_gzip_variants_are_written(self):
+        self.assertNotEqual(self.hashed_css, BOOTSTRAP_CSS)
+        self.assertTrue((Path(self.static_root) / (self.hashed_css + ".gz")).is_file())
+
+    def test_gzip_served_when_accepted(self):
+        response = self.get(self.hashed_css, accept_encoding="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertFalse(self.get(self.hashed_css).has_header("Content-Encoding"))
+
+    def test_only_hashed_names_are_immutable(self):
+        self.assertIn("immutable", self.get(self.hashed_css)["Cache-Control"])
+        self.assertNotIn("immutable", self.get(BOOTSTRAP_CSS).get("Cache-Control", ""))
+
+
+class CatalogApiTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.movies = [
+            Movie.objects.create(title=f"Movie {i}", price="9.99", description="d") for i in range(5)
+        ]
+        cls.user = User.objects.create_user("reviewer", password="pw")
+        Review.objects.create(movie=cls.movies[0], user=cls.user, rating=5, text="great")
+
+    def test_fields_projection(self):
+        data = self.client.get("/api/movies/?fields=title,price").json()
+        self.assertEqual(data["results"][0], {"title": "Movie 0", "price": "9.99"})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get("/api/movies/?fields=title,secret")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pagination_walks_every_row_once(self):
+        titles, url = [], "/api/movies/?limit=2&fields=title"
+        while True:
+            data = self.client.get(url).json()
+            titles += [row["title"] for row in data["results"]]
+            if not data["next_cursor"]:
+                break
+            url = f"/api/movies/?limit=2&fields=title&cursor={data['next_cursor']}"
+        self.assertEqual(titles, [m.title for m in self.movies])
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ("!!", "LTE", "OTk5OTk5OTk5OTk5OTk5OTk5OTk5"):
+            self.assertEqual(self.client.get(f"/api/movies/?cursor={cursor}").status_code, 400, cursor)
+
+    def test_etag_returns_not_modified(self):
+        first = self.client.get("/api/movies/")
+        second = self.client.get("/api/movies/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+
+    def test_bad_movie_filter_is_rejected(self):
+        for value in ("abc", "99999999999999999999999", "²", "-1"):
+            self.assertEqual(self.client.get("/api/reviews/", {"movie": value}).status_code, 400, value)
+        data = self.client.get("/api/reviews/", {"movie": self.movies[0].pk}).json()
+        self.assertEqual([r["user"] for r in data["results"]], ["reviewer"])
+
+    def test_encoding_does_not_depend_on_orjson(self):
+        with_orjson = self.client.get("/api/reviews/").content
+        with mock.patch.object(api, "orjson", None):
+            without_orjson = self.client.get("/api/reviews/").content
+        self.assertEqual(with_orjson, without_orjson)
+
+
+class TitleIndexTests(StoreTestCase):
+    def test_prefix_matches_title_and_word_starts(self):
+        index = TitleIndex()
+        index.build(rows=[(1, "Spider Man: No Way Home"), (2, "Inception"), (3, "Dune")])
+        self.assertEqual([r["id"] for r in index.search("no way")], [1])
+        self.assertEqual([r["id"] for r in index.search("IN")], [2])
+
+    def test_incremental_add_and_remove(self):
+        index = TitleIndex()
+        index.build(rows=[(1, "Dune")])
+        index.add(2, "Dune Part Two")
+        self.assertEqual([r["id"] for r in index.search("dune")], [1, 2])
+        index.remove(2)
+        self.assertEqual(index.search("part"), [])
+        self.assertEqual(len(index), 1)
+
+    def test_casefold_expansion_does_not_corrupt_ids(self):
+        index = TitleIndex()
+        index.build(rows=[(2, "ß" * 150 + " zebra"), (1, "Alpha")])
+        self.assertEqual([r["id"] for r in index.search("alpha")], [1])
+        self.assertEqual([r["id"] for r in index.search("zebra")], [2])
+
+
+class AutocompleteTests(StoreTestCase):
+    def setUp(self):
+        cache.clear()
+        title_index.build()
+
+    def suggest(self, q):
+        return [r["title"] for r in self.client.get("/api/movies/autocomplete/", {"q": q}).json()["results"]]
+
+    def test_signals_update_this_process(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            movie = Movie.objects.create(title="Arrival", price="9.99", description="d")
+        self.assertEqual(self.suggest("arr"), ["Arrival"])
+        with self.captureOnCommitCallbacks(execute=True):
+            movie.title = "Arrival (2016)"
+            movie.save()
+        self.assertEqual(self.suggest("arr"), ["Arrival (2016)"])
+        with self.captureOnCommitCallbacks(execute=True):
+            movie.delete()
+        self.assertEqual(self.suggest("arr"), [])
+
+    @mock.patch.object(search, "CHECK_SECONDS", 0)
+    def test_rebuilds_after_changes_in_other_processes(self):
+        # Without running the on_commit callbacks, only the DB sees these changes.
+        movie = Movie.objects.create(title="Arrival", price="9.99", description="d")
+        self.assertEqual(self.suggest("arr"), ["Arrival"])
+        movie.delete()
+        self.assertEqual(self.suggest("arr"), [])
+
+    def test_checks_are_rate_limited(self):
+        Movie.objects.create(title="Arrival", price="9.99", description="d")
+        self.assertEqual(self.suggest("arr"), [])
+
+    @mock.patch.object(search, "CHECK_SECONDS", 0)
+    def test_rename_elsewhere_is_seen_through_the_version_key(self):
+        movie = Movie.objects.create(title="Arrival", price="9.99", description="d")
+        self.assertEqual(self.suggest("arr"), ["Arrival"])
+        # Same count and max id: only the version bump reveals the rename.
+        Movie.objects.filter(pk=movie.pk).update(title="Sicario")
+        search._bump_version()
+        self.assertEqual(self.suggest("sic"), ["Sicario"])
+
+
+class OwnedBadgeTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user("buyer", password="pw")
+        cls.browser = User.objects.create_user("browser", password="pw")
+        cls.dune = Movie.objects.create(title="Dune", price="15.00", description="d")
+        Movie.objects.create(title="Arrival", price="9.99", description="d")
+        order = Order.objects.create(user=cls.buyer)
+        OrderItem.objects.create(order=order, movie=cls.dune, quantity=1, price="15.00")
+
+    def setUp(self):
+        cache.clear()
+
+    def count_list_queries(self, user):
+        self.client.force_login(user)
+        self.client.get("/movies/")  # fills the cache
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/movies/")
+        return len(ctx.captured_queries), response
+
+    def test_list_queries_do_not_depend_on_owned_movies(self):
+        owning, response = self.count_list_queries(self.buyer)
+        self.assertContains(response, "Owned", count=1)
+        not_owning, response = self.count_list_queries(self.browser)
+        self.assertNotContains(response, "Owned")
+        self.assertEqual(owning, not_owning)
+
+    def test_checkout_shows_badge_on_next_page(self):
+        self.client.force_login(self.browser)
+        self.assertNotContains(self.client.get("/movies/"), "Owned")
+        self.client.get(f"/cart/add/{self.dune.pk}/")
+        self.client.get("/checkout/")
+        self.assertContains(self.client.get("/movies/"), "Owned", count=1)
+
+    def test_checkout_in_another_process_is_seen(self):
+        # A per-process cache is never told about orders placed elsewhere.
+        self.assertEqual(owned.owned_movie_ids(self.browser), frozenset())
+        order = Order.objects.create(user=self.browser)
+        OrderItem.objects.create(order=order, movie=self.dune, quantity=1, price="15.00")
+        self.assertEqual(owned.owned_movie_ids(self.browser), {self.dune.pk})
+
+    def test_archived_orders_still_count(self):
+        self.assertEqual(owned.owned_movie_ids(self.buyer), {self.dune.pk})
+        archive.archive_batch(timezone.now() + timedelta(days=1))
+        self.assertEqual(owned.owned_movie_ids(self.buyer), {self.dune.pk})
+
+    def test_anonymous_users_own_nothing_without_a_query(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(owned.owned_movie_ids(AnonymousUser()), frozenset())
+
+
+class TaskQueueTests(StoreTestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def enqueue(self, func, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            func.enqueue(*args, **kwargs)
+
+    def make_due(self):
+        Task.objects.update(run_at=timezone.now() - timedelta(seconds=1))
+
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            record_call.enqueue(1)
+        self.assertEqual(Task.objects.count(), 0)
+        callbacks[0]()
+        self.assertEqual(Task.objects.get().name, "store.tests.record_call")
+
+    def test_dedup_key_collides_only_while_active(self):
+        self.enqueue(record_call, 1, dedup_key="k")
+        self.enqueue(record_call, 2, dedup_key="k")
+        self.assertEqual(Task.objects.count(), 1)
+
+        tasks.run_task(tasks.claim_next())
+        self.assertEqual(CALLS, [1])
+        self.enqueue(record_call, 3, dedup_key="k")
+        self.assertEqual(Task.objects.filter(status=Task.PENDING).count(), 1)
+
+    def test_retry_with_backoff_then_failed(self):
+        self.enqueue(always_fails)
+        with self.assertLogs("store.tasks", "WARNING"):
+            task = tasks.run_task(tasks.claim_next())
+        self.assertEqual((task.status, task.attempts), (Task.PENDING, 1))
+        self.assertGreater(task.run_at, timezone.now())
+        self.assertIsNone(tasks.claim_next())  # still backing off
+
+        self.make_due()
+        with self.assertLogs("store.tasks", "ERROR"):
+            task = tasks.run_task(tasks.claim_next())
+        self.assertEqual((task.status, task.attempts), (Task.FAILED, 2))
+        self.assertIn("RuntimeError: boom", task.last_error)
+        self.assertIsNotNone(task.run_ms)
+
+    def test_backoff_is_exponential_and_capped(self):
+        self.assertEqual([tasks.backoff_seconds(n) for n in (1, 2, 3)], [2, 4, 8])
+        self.assertEqual(tasks.backoff_seconds(50), tasks.BACKOFF_MAX_SECONDS)
+
+    def test_claim_is_conditional(self):
+        self.enqueue(record_call, 1)
+        task = tasks.claim_next()
+        self.assertEqual((task.status, task.attempts), (Task.RUNNING, 1))
+        self.assertIsNone(tasks.claim_next())
+
+    def test_claim_skips_task_taken_by_another_worker(self):
+        self.enqueue(record_call, 1)
+        task_id = Task.objects.get().pk
+        real_filter = Task.objects.filter
+
+        def racing_filter(*args, **kwargs):
+            # Another worker wins the race right before our conditional UPDATE.
+            if kwargs.get("pk") == task_id:
+                real_filter(pk=task_id).update(status=Task.RUNNING)
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(Task.objects, "filter", side_effect=racing_filter):
+            self.assertIsNone(tasks.claim_next())
+
+    def test_requeue_stale(self):
+        self.enqueue(record_call, 1)
+        self.enqueue(record_call, 2)
+        old, fresh = Task.objects.order_by("id")
+        Task.objects.filter(pk=old.pk).update(
+            status=Task.RUNNING, started_at=timezone.now() - timedelta(hours=2)
+        )
+        Task.objects.filter(pk=fresh.pk).update(status=Task.RUNNING, started_at=timezone.now())
+
+        self.assertEqual(tasks.requeue_stale(seconds=3600), 1)
+        self.assertEqual(Task.objects.get(pk=old.pk).status, Task.PENDING)
+        self.assertEqual(Task.objects.get(pk=fresh.pk).status, Task.RUNNING)
+
+    def test_task_metrics(self):
+        self.enqueue(record_call, 1)
+        tasks.run_task(tasks.claim_next())
+        (row,) = tasks.task_metrics()
+        self.assertEqual((row["name"], row["count"]), ("store.tests.record_call", 1))
+
+    def test_worker_survives_database_errors(self):
+        claims = [OperationalError("database is locked"), None]
+        # Keep the test database connection open; the worker would close it.
+        with mock.patch.object(tasks, "claim_next", side_effect=claims), \
+                mock.patch("store.management.commands.run_workers.connections"), \
+                mock.patch("store.management.commands.run_workers.close_old_connections"):
+            with self.assertLogs("store.management.commands.run_workers", "ERROR"):
+                _worker_loop(threading.Event(), 0, once=True)
+
+
+# Runs in a fresh interpreter against its own SQLite file: worker processes
+# can't see the test runner's in-memory database.
+SPAWNED_WORKER_SCRIPT = """
+import multiprocessing
+import django
+from django.core.management import call_command
+
+multiprocessing.set_start_method("spawn")
+django.setup()
+from django.utils import timezone
+from store.models import Task
+
+call_command("migrate", verbosity=0)
+Task.objects.create(name="time.sleep", args=[0], max_attempts=1, run_at=timezone.now())
+call_command("run_workers", mode="process", workers=1, once=True)
+print(Task.objects.get().status)
+"""
+
+
+class ProcessWorkerTests(SimpleTestCase):
+    def test_spawned_worker_runs_tasks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "spawn_settings.py").write_text(
+                "from gtstore.settings import *\n"
+                f"DATABASES = {{'default': {{'ENGINE': 'django.db.backends.sqlite3', 'NAME': {str(Path(tmp, 'db.sqlite3'))!r}}}}}\n"
+            )
+            env = dict(
+                os.environ,
+                DJANGO_SETTINGS_MODULE="spawn_settings",
+                PYTHONPATH=os.pathsep.join([tmp, str(settings.BASE_DIR)]),
+            )
+            proc = subprocess.run(
+                [sys.executable, "-c", SPAWNED_WORKER_SCRIPT],
+                env=env, cwd=tmp, capture_output=True, text=True, timeout=120,
+            )
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.splitlines()[-1], Task.DONE, proc.stderr)
+
+
+class ProfilingTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.admin = User.objects.create_superuser("root", password="pw")
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        patcher = mock.patch.object(profiling, "PROFILE_DIR", self.dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def captured(self):
+        return [json.loads(p.read_text()) for p in sorted(self.dir.glob("*.json"))]
+
+    def test_only_explicit_opt_in_triggers(self):
+        self.client.force_login(self.admin)
+        self.client.get("/movies/?_profile=0")
+        self.assertEqual(self.captured(), [])
+        self.client.get("/movies/?_profile=1")
+        self.assertEqual(len(self.captured()), 1)
+
+    def test_staff_cannot_trigger(self):
+        self.client.force_login(self.staff)
+        self.client.get("/movies/?_profile=1", headers={"X-Profile": "1"})
+        self.assertEqual(self.captured(), [])
+
+    @mock.patch.object(profiling, "PROFILE_MAX_FILES", 2)
+    def test_oldest_profiles_are_pruned(self):
+        for stem in ("20260101T000000000000-old-1", "20260102T000000000000-newer-1"):
+            (self.dir / f"{stem}.json").write_text("{}")
+            (self.dir / f"{stem}.prof").write_bytes(b"")
+        self.client.force_login(self.admin)
+        self.client.get("/movies/?_profile=1")
+        names = sorted(p.name for p in self.dir.iterdir())
+        self.assertEqual(len(names), 4)
+        self.assertFalse(any(name.startswith("20260101") for name in names))
+
+    def test_session_query_params_are_redacted(self):
+        self.client.force_login(self.admin)
+        with mock.patch.object(profiling, "PROFILE_SAMPLE_RATE", 1.0):
+            self.client.get("/movies/")
+        queries = self.captured()[0]["queries"]
+        session_queries = [q for q in queries if "django_session" in q["sql"]]
+        self.assertTrue(session_queries)
+        self.assertTrue(all(q["params"] == profiling.REDACTED for q in session_queries))
+        self.assertNotIn(self.client.session.session_key, json.dumps(queries))
+
+    def test_pages_are_superuser_only(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get("/admin/profiles/").status_code, 403)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get("/admin/profiles/").status_code, 200)
+
+    def test_corrupt_and_incomplete_profiles(self):
+        (self.dir / "20260101T000000000000-broken-1.json").write_text('{"path": ')
+        (self.dir / "20260101T000000000000-noprof-1.json").write_text(json.dumps({"path": "/x"}))
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get("/admin/profiles/").status_code, 200)
+        response = self.client.get("/admin/profiles/20260101T000000000000-noprof-1/")
+        self.assertEqual(response.status_code, 404)
+
+
+class OrderArchiveTests(StoreTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", password="pw")
+        cls.movie = Movie.objects.create(title="Amélie", price="12.99", description="d")
+        cls.other = Movie.objects.create(title="Dune", price="15.00", description="d")
+
+    def place_order(self, days_ago, *items):
+        order = Order.objects.create(user=self.user)
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        for movie, quantity in items:
+            OrderItem.objects.create(order=order, movie=movie, quantity=quantity, price=movie.price)
+        return order
+
+    def test_pack_items_round_trip(self):
+        items = [(1, 2, Decimal("12.99"), "Amélie"), (99, 1, Decimal("15.00"), "")]
+        archived = ArchivedOrder(items_blob=ArchivedOrder.pack_items(items))
+        self.assertEqual([tuple(line) for line in archived.line_items()], items)
+        self.assertEqual(str(archived.line_items()[1].price), "15.00")
+        self.assertEqual(archived.movie_ids(), [1, 99])
+
+    def test_archive_moves_only_old_orders_in_batches(self):
+        old = [self.place_order(400, (self.movie, 2), (self.other, 1)) for _ in range(3)]
+        recent = self.place_order(1, (self.movie, 1))
+
+        cutoff = timezone.now() - timedelta(days=365)
+        self.assertEqual(archive.archive_batch(cutoff, batch_size=2), 2)
+        self.assertEqual(archive.archive_orders(older_than_days=365, batch_size=2), 1)
+
+        self.assertEqual(list(Order.objects.values_list("pk", flat=True)), [recent.pk])
+        self.assertEqual(OrderItem.objects.count(), 1)
+        archived = ArchivedOrder.objects.get(pk=old[0].pk)
+        self.assertEqual(archived.total, Decimal("40.98"))
+        self.assertEqual([line.title for line in archived.line_items()], ["Amélie", "Dune"])
+
+    def test_archived_history_survives_movie_deletion(self):
+        self.place_order(400, (self.other, 1))
+        archive.archive_orders(older_than_days=365)
+        self.other.delete()  # no longer PROTECTed by an OrderItem
+
+        self.client.force_login(self.user)
+        response = self.client.get("/orders/?archived=1")
+        self.assertContains(response, "Dune — $15.00 × 1")
+
+
+class ThrottleTests(StoreTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_rate(self):
+        self.assertEqual(throttling.parse_rate("60/m"), (60, 60))
+        self.assertEqual(throttling.parse_rate("5/hour"), (5, 3600))
+        for bad in ("60", "60/", "60/x", "many/m"):
+            with self.assertRaises(ValueError):
+                throttling.parse_rate(bad)
+
+    def test_sliding_window(self):
+        now = 6_000_020.0  # 20 s into a minute window
+        waits = [throttling.hit("k", 3, 60, now=now) for _ in range(4)]
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertEqual(waits[3], 40.0)
+        # Rejected hits don't count.
+        self.assertEqual(throttling.hit("k", 3, 60, now=now + 39), 1.0)
+        # The next window still sees the previous one, weighted by overlap:
+        # 3 * (60 - 0) / 60 + 1 > 3, allowed once 3 * (60 - t) / 60 + 1 <= 3, i.e. t >= 20.
+        self.assertAlmostEqual(throttling.hit("k", 3, 60, now=now + 40), 20.0)
+        self.assertEqual(throttling.hit("k", 3, 60, now=now + 61), 0)
+
+    def test_no_double_burst_across_window_boundary(self):
+        boundary = 6_000_000.0
+        allowed = sum(
+            throttling.hit("k", 60, 60, now=boundary + offset) == 0
+            for offset in [-1.0] * 60 + [0.5] * 60
+        )
+        self.assertEqual(allowed, 60)  # a fixed window would allow 120
+
+    def test_keys_are_independent(self):
+        self.assertEqual(throttling.hit("a", 1, 60, now=0), 0)
+        self.assertEqual(throttling.hit("b", 1, 60, now=0), 0)
+        self.assertGreater(throttling.hit("a", 1, 60, now=0), 0)
+
+    @override_settings(THROTTLE_RATES={"cart": "2/m"})
+    def test_view_returns_429_and_records_metrics(self):
+        movie = Movie.objects.create(title="Dune", price="15.00", description="d")
+        codes = [self.client.get(f"/cart/add/{movie.pk}/").status_code for _ in range(3)]
+        self.assertEqual(codes, [302, 302, 429])
+        response = self.client.get("/cart/clear/")
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+        self.assertEqual(throttling.throttle_metrics()["cart"], {"allowed": 2, "throttled": 2})
+
+    @override_settings(THROTTLE_RATES={"cart": "60"})
+    def test_malformed_rate_is_reported_not_fatal(self):
+        self.assertEqual([e.id for e in throttling.check_throttle_rates(None)], ["store.E001"])
+        movie = Movie.objects.create(title="Dune", price="15.00", description="d")
+        with self.assertLogs("store.throttling", "WARNING"):
+            response = self.client.get(f"/cart/add/{movie.pk}/")
+        self.assertEqual(response.status_code, 302)
+
+
+class WarmupTests(StoreTransactionTestCase):
+    def setUp(self):
+        Movie.objects.create(title="Dune", price="15.00", description="d")
+
+    def test_runs_inside_event_loop(self):
+        async def serve():
+            return warmup.warm_up()
+
+        with self.assertNoLogs("store.warmup", "ERROR"):
+            timings = asyncio.run(serve())
+        self.assertEqual(list(timings), [name for name, _ in warmup.STEPS])
+
+    @override_settings(WARMUP_ON_STARTUP=True)
+    def test_startup_closes_connections(self):
+        with mock.patch.object(warmup, "warm_up", return_value={}), \
+                mock.patch.object(warmup, "connections") as connections:
+            warmup.startup_complete("test", 0.0)
+        connections.close_all.assert_called_once_with()
+
+    def test_off_by_default(self):
+        with mock.patch.object(warmup, "warm_up") as warm_up:
+            warmup.startup_complete("test", 0.0)
+        warm_up.assert_not_called()
@@ -0,0 +1,131 @@
+"""Rate limiting for views.
+
+    @throttle("cart")
+    def cart_add(request, movie_id): ...
+
+The rate for a scope comes from `THROTTLE_RATES` ("60/m" = about 60 requests
+in any minute). Requests are counted per clock-aligned window, and the previous
+window's count is weighted by how much of it still falls in the last period
+(a sliding-window approximation), so bursts straddling a window boundary stay
+near the limit instead of reaching twice it. Counters are keyed by user id for
+signed-in users and by client IP otherwise, and live in the default cache.
+They only use the cache's atomic `add`/`incr`, so the limit holds across
+processes when the cache is shared (Redis/Memcached). Over the limit the view
+answers 429 with `Retry-After`. A malformed rate fails `manage.py check` and
+leaves its scope unthrottled at runtime.
+"""
+import logging
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+OUTCOMES = ("allowed", "throttled")
+
+
+def parse_rate(rate):
+    """'60/m' -> (limit, period in seconds). Raises ValueError if malformed."""
+    count, _, unit = str(rate).partition("/")
+    if unit[:1] not in PERIODS:
+        raise ValueError(f"Invalid throttle rate {rate!r}, expected e.g. '60/m'")
+    return int(count), PERIODS[unit[0]]
+
+
+@checks.register()
+def check_throttle_rates(app_configs, **kwargs):
+    errors = []
+    for scope, rate in getattr(settings, "THROTTLE_RATES", {}).items():
+        try:
+            parse_rate(rate)
+        except ValueError as exc:
+            errors.append(checks.Error(
+                f"THROTTLE_RATES[{scope!r}]: {exc}",
+                hint="Use '<count>/<s|m|h|d>'.",
+                id="store.E001",
+            ))
+    return errors
+
+
+def client_ident(request):
+    if request.user.is_authenticated:
+        return f"u{request.user.pk}"
+    # REMOTE_ADDR only: X-Forwarded-For is client-controlled unless a trusted proxy rewrites it.
+    return "ip" + request.META.get("REMOTE_ADDR", "")
+
+
+def _incr(cache, key, timeout):
+    """Atomically increment `key`, creating it with `timeout` if needed."""
+    try:
+        return cache.incr(key)
+    except ValueError:  # missing or just expired
+        if cache.add(key, 1, timeout):
+            return 1
+        return cache.incr(key)  # another process created it first
+
+
+def hit(key, limit, period, now=None):
+    """Count one request against `key`; return seconds to wait (0 if allowed)."""
+    now = time.time() if now is None else now
+    window, elapsed = divmod(now, period)
+    window = int(window)
+    cache = caches["default"]  # one handler lookup instead of going through the `cache` proxy
+    window_key = f"{key}:{window}"
+    # Kept for two periods: it is the previous window of the next one.
+    count = _incr(cache, window_key, 2 * period + 1)
+    previous = cache.get(f"{key}:{window - 1}", 0)
+    if previous * (1 - elapsed / period) + count <= limit:
+        return 0.0
+    # Rejected requests don't use up the allowance.
+    cache.decr(window_key)
+    if count > limit or not previous:
+        return period - elapsed
+    # Wait until enough of the previous window has slid out.
+    return (1 - (limit - count) / previous) * period - elapsed
+
+
+def throttle(scope):
+    """Limit a view to the `THROTTLE_RATES[scope]` rate per user/IP."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            rate = getattr(settings, "THROTTLE_RATES", {}).get(scope)
+            if not rate or not getattr(settings, "THROTTLE_ENABLED", True):
+                return view(request, *args, **kwargs)
+            try:
+                limit, period = parse_rate(rate)
+            except ValueError:
+                logger.warning("Not throttling %r: invalid rate %r", scope, rate)
+                return view(request, *args, **kwargs)
+            wait = hit(f"throttle:{scope}:{client_ident(request)}", limit, period)
+            _incr(caches["default"], f"throttle-metrics:{scope}:{OUTCOMES[bool(wait)]}", None)
+            if wait:
+                response = HttpResponse("Too many requests, please slow down.", status=429, content_type="text/plain")
+                response["Retry-After"] = str(max(1, math.ceil(wait)))
+                return response
+            return view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
+
+
+def throttle_metrics():
+    """Allowed/throttled counts per configured scope, shared through the cache."""
+    scopes = getattr(settings, "THROTTLE_RATES", {})
+    keys = [f"throttle-metrics:{scope}:{outcome}" for scope in scopes for outcome in OUTCOMES]
+    counts = caches["default"].get_many(keys)
+    return {
+        scope: {outcome: counts.get(f"throttle-metrics:{scope}:{outcome}", 0) for outcome in OUTCOMES}
+        for scope in scopes
+    }
+
+
+def metrics_view(request):
+    return JsonResponse({"rates": getattr(settings, "THROTTLE_RATES", {}), "counts": throttle_metrics()})
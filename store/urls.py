@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", views.home, name="home"),
@@ -25,4 +25,11 @@ urlpatterns = [
     path("petitions/", views.petition_list, name="petition_list"),
     path("petitions/<int:petition_id>/vote/", views.petition_vote, name="petition_vote"),
     path("petitions/<int:petition_id>/delete/", views.petition_delete, name="petition_delete"),
+
+    # Read-only JSON API
+    path("api/movies/", api.movie_list, name="api_movie_list"),
+    path("api/movies/autocomplete/", api.movie_autocomplete, name="api_movie_autocomplete"),
+    path("api/movies/<int:pk>/", api.movie_detail, name="api_movie_detail"),
+    path("api/reviews/", api.review_list, name="api_review_list"),
+    path("api/petitions/", api.petition_list, name="api_petition_list"),
 ]
\ No newline at end of file
@@ -4,10 +4,13 @@ from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q, Avg, Count
 from django.contrib import messages
-from .models import Movie, Review, Order, OrderItem, ReviewReport, Petition, PetitionVote
+from django.core.paginator import Paginator
+from .models import Movie, Review, Order, OrderItem, ReviewReport, Petition, PetitionVote, ArchivedOrder
 from .forms import SignUpForm, ReviewForm, PetitionForm
+from .throttling import throttle
 
 CART_SESSION_KEY = "cart"
+ORDERS_PER_PAGE = 20
 
 def _get_cart(session):
     cart = session.get(CART_SESSION_KEY)
@@ -59,6 +62,7 @@ def movie_detail(request, pk):
 
 
 @login_required
+@throttle("report_review")
 def report_review(request, pk):
     """Create a Report for a review so it will be hidden for the reporting user.
 
@@ -87,6 +91,7 @@ def signup(request):
     return render(request, "registration/signup.html", {"form": form})
 
 @login_required
+@throttle("review")
 def add_review(request, movie_id):
     movie = get_object_or_404(Movie, pk=movie_id)
     if request.method == "POST":
@@ -133,6 +138,7 @@ def cart_detail(request):
     items, total = _cart_items(cart)
     return render(request, "cart/detail.html", {"items": items, "total": total})
 
+@throttle("cart")
 def cart_add(request, movie_id):
     movie = get_object_or_404(Movie, pk=movie_id)
     cart = _get_cart(request.session)
@@ -141,6 +147,7 @@ def cart_add(request, movie_id):
     request.session.modified = True
     return redirect("cart_detail")
 
+@throttle("cart")
 def cart_remove(request, movie_id):
     cart = _get_cart(request.session)
     mid = str(movie_id)
@@ -152,6 +159,7 @@ def cart_remove(request, movie_id):
         request.session.modified = True
     return redirect("cart_detail")
 
+@throttle("cart")
 def cart_clear(request):
     if CART_SESSION_KEY in request.session:
         del request.session[CART_SESSION_KEY]
@@ -179,8 +187,30 @@ def checkout(request):
 
 @login_required
 def order_list(request):
-    orders = request.user.orders.prefetch_related("items__movie").order_by("-created_at")
-    return render(request, "orders/list.html", {"orders": orders})
+    """Recent (hot) orders, paged. Archived history is only loaded with ?archived=1."""
+    archived = request.GET.get("archived") == "1"
+    if archived:
+        orders = ArchivedOrder.objects.filter(user=request.user).order_by("-created_at")
+    else:
+        orders = request.user.orders.prefetch_related("items__movie").order_by("-created_at")
+    page = Paginator(orders, ORDERS_PER_PAGE).get_page(request.GET.get("page"))
+
+    if archived:
+        # Line items (with title snapshots) are decoded from the packed blob; no extra queries.
+        for o in page:
+            o.lines = o.line_items()
+        has_archived = True
+    else:
+        has_archived = (
+            not page.has_next()
+            and ArchivedOrder.objects.filter(user=request.user).exists()
+        )
+    return render(request, "orders/list.html", {
+        "orders": page,
+        "page": page,
+        "archived": archived,
+        "has_archived": has_archived,
+    })
 
 
 # NEW PETITION VIEWS
@@ -212,6 +242,7 @@ def petition_list(request):
 
 
 @login_required
+@throttle("petition_vote")
 def petition_vote(request, petition_id):
     """Allow users to vote on a petition"""
     petition = get_object_or_404(Petition, pk=petition_id)
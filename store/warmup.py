@@ -0,0 +1,134 @@
+"""Warm a freshly started process before it takes traffic.
+
+`gtstore.wsgi` / `gtstore.asgi` call `startup_complete()` once the application
+is built. With `WARMUP_ON_STARTUP` (off by default) it then compiles every project template
+into the cached loader, populates the URL resolver, builds the title index and
+renders the catalog pages once. Timings end up in `STARTUP_TIMINGS` and the
+log. `manage.py warmup` runs the same steps and can record cold-start cost.
+"""
+import asyncio
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+STARTUP_TIMINGS = {}
+
+
+def _template_names():
+    """Relative names of all .html templates in the project and store app."""
+    engine = engines["django"].engine
+    dirs = [Path(d) for d in engine.dirs] + [Path(__file__).resolve().parent / "templates"]
+    names = set()
+    for base in dirs:
+        if base.is_dir():
+            names.update(path.relative_to(base).as_posix() for path in base.rglob("*.html"))
+    return sorted(names)
+
+
+def warm_templates():
+    engine = engines["django"]
+    for name in _template_names():
+        engine.get_template(name)
+
+
+def warm_urls():
+    get_resolver().url_patterns
+    reverse("movie_list")
+
+
+def warm_title_index():
+    from .search import title_index
+    title_index.build()
+
+
+def warm_catalog():
+    """Render the catalog views once so DB connections and template code paths are hot."""
+    from django.test import RequestFactory
+
+    from . import views
+    from .models import Movie
+
+    factory = RequestFactory()
+
+    def get(path):
+        request = factory.get(path)
+        request.user = AnonymousUser()
+        request.session = {}
+        return request
+
+    views.movie_list(get(reverse("movie_list")))
+    movie_id = Movie.objects.values_list("id", flat=True).first()
+    if movie_id is not None:
+        views.movie_detail(get(reverse("movie_detail", args=[movie_id])), pk=movie_id)
+
+
+STEPS = [
+    ("templates", warm_templates),
+    ("urls", warm_urls),
+    ("title_index", warm_title_index),
+    ("catalog", warm_catalog),
+]
+
+
+def _run_steps():
+    timings = {}
+    for name, step in STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step %r failed", name)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    return timings
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def warm_up():
+    """Run every warm-up step; return `{step: ms}`. A failing step is logged, not raised.
+
+    ASGI servers import the app inside a running event loop, where the ORM
+    refuses synchronous queries, so there the steps run in a short-lived thread.
+    """
+    if not _in_event_loop():
+        return _run_steps()
+    timings = {}
+
+    def run():
+        try:
+            timings.update(_run_steps())
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=run, name="warmup")
+    thread.start()
+    thread.join()
+    return timings
+
+
+def startup_complete(entry_point, started):
+    """Record how long `entry_point` took to import and set up, then warm up."""
+    STARTUP_TIMINGS["entry_point"] = entry_point
+    STARTUP_TIMINGS["setup_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    if getattr(settings, "WARMUP_ON_STARTUP", False):
+        STARTUP_TIMINGS["warmup"] = warm_up()
+        # Don't hand warm-up connections to workers forked from this process
+        # (e.g. gunicorn --preload); each opens its own on first use.
+        connections.close_all()
+    STARTUP_TIMINGS["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info("%s ready in %s ms: %s", entry_point, STARTUP_TIMINGS["total_ms"], STARTUP_TIMINGS)
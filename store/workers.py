@@ -0,0 +1,21 @@
+"""Entry point for the worker processes of `manage.py run_workers --mode process`.
+
+With the "spawn" start method (the default on macOS and Windows) a child is a
+fresh interpreter that imports the target's module before running it. This
+module therefore must not import models at the top; Django is set up first
+thing in the target instead.
+"""
+import signal
+
+
+def run_worker_process(stop, poll_interval, once):
+    import django
+
+    django.setup()  # no-op when the process was forked from a set-up parent
+    # Spawned children don't inherit the parent's handlers: finish the current task on Ctrl-C.
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    from store.management.commands.run_workers import _worker_loop
+
+    _worker_loop(stop, poll_interval, once)